@@ -4,16 +4,23 @@ import config
 import logging
 import requests
 import json
+import orjson
 import traceback
 import os
+import sys
 import time
+from functools import lru_cache
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from opencensus.ext.azure.log_exporter import AzureLogHandler
-from opencensus.common.transports.async_ import AsyncTransport
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from azure.monitor.opentelemetry import configure_azure_monitor
 from azure.identity import ClientSecretCredential
 # from azure.mgmt.datafactory import DataFactoryManagementClient
-from azure.storage.blob import BlobServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobPrefix, BlobServiceClient
 
 
 # Get the name of the function that failed
@@ -23,6 +30,28 @@ def get_failed_function_name():
     return tb.name
 
 
+@lru_cache(maxsize=1)
+def _get_credential():
+    """Return the process-wide storage credential, so its token cache is shared."""
+    return ClientSecretCredential(
+        config.AZURE_TENANT_ID,
+        config.AZURE_CLIENT_ID,
+        config.AZURE_CLIENT_SECRET
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_data_factory_credential():
+    """Return the process-wide Data Factory credential, reusing the storage one for the same SPN."""
+    if config.AZURE_DATA_FACTORY_CLIENT_ID == config.AZURE_CLIENT_ID:
+        return _get_credential()
+    return ClientSecretCredential(
+        config.AZURE_TENANT_ID,
+        config.AZURE_DATA_FACTORY_CLIENT_ID,
+        config.AZURE_DATA_FACTORY_CLIENT_SECRET
+    )
+
+
 class CustomError(Exception):
     """Custom error class that includes the failed function and message."""
     def __init__(self, unit: str, message: str):
@@ -40,25 +69,59 @@ class LoggerAPI:
     AZURE_LIVE_ENDPOINT                     = config.AZURE_LIVE_ENDPOINT
     AZURE_APPLICATION_ID                    = config.AZURE_APPLICATION_ID
     AZURE_INSIGHTS_LOGGER_LEVEL             = config.AZURE_INSIGHTS_LOGGER_LEVEL
+    RESERVED_PROP_PREFIX                    = "prop_"
+
+    # LogRecord attribute names; passing one of these in extra makes makeRecord raise KeyError
+    _RESERVED_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
 
     def __init__(self):
         """Initialize the logger with Azure Application Insights handler."""
+        # Attach the Azure Monitor OpenTelemetry handler (batched export via BatchLogRecordProcessor,
+        # tuned with OTEL_BLRP_* environment variables). Only logs are exported.
+        configure_azure_monitor(
+            connection_string=f"InstrumentationKey={self.AZURE_INSIGHTS_INSTRUMENTATION_KEY};IngestionEndpoint={self.AZURE_INGESTS_ENDPOINT};LiveEndpoint={self.AZURE_LIVE_ENDPOINT};ApplicationId={self.AZURE_APPLICATION_ID}",
+            logger_name=self.AZURE_INSIGHTS_LOGGER_NAME,
+            disable_tracing=True,
+            disable_metrics=True
+        )
+
         # Configure logging
         self.logger = logging.getLogger(self.AZURE_INSIGHTS_LOGGER_NAME)
         self.logger.setLevel(self.AZURE_INSIGHTS_LOGGER_LEVEL)  # Change to logging.INFO to reduce verbosity  
+        self.logger.propagate = False  # Records only go to the Application Insights handler
 
-        self.logger.addHandler(
-            AzureLogHandler(
-                connection_string=f"InstrumentationKey={self.AZURE_INSIGHTS_INSTRUMENTATION_KEY};IngestionEndpoint={self.AZURE_INGESTS_ENDPOINT};LiveEndpoint={self.AZURE_LIVE_ENDPOINT};ApplicationId={self.AZURE_APPLICATION_ID}",
-                transport=AsyncTransport
-            )
-        )
+        # Dimensions attached to every record; uses the resolved name ("root" when no name is configured)
+        self._base_dims = {"logger_name": self.logger.name}
+
+        # Severity dispatch resolved once instead of per call
+        self._log_methods = {
+            "DEBUG": self.logger.debug,
+            "INFO": self.logger.info,
+            "WARNING": self.logger.warning,
+            "ERROR": self.logger.error,
+            "CRITICAL": self.logger.critical,
+        }
 
     def log_event(self, event_name, message, severity="INFO", unit=None, **props):
         """ Structured log with event name and custom properties """
 
-        log_method = getattr(self.logger, severity.lower(), self.logger.info)
-        log_method(message, extra={"custom_dimensions": {"logger_name": self.logger.name, "event": event_name, "unit": unit, **props}})
+        # OpenTelemetry exports each extra attribute as a custom dimension; attributes must be primitives, so
+        # properties are passed flat and unit is only attached when set. props is a fresh dict per call, so it
+        # is used as the extra mapping directly; names that collide with LogRecord attributes get a prefix.
+        for key in self._RESERVED_ATTRS.intersection(props):
+            props[self.RESERVED_PROP_PREFIX + key] = props.pop(key)
+
+        props.update(self._base_dims)
+        props["event"] = event_name
+        if unit is not None:
+            props["unit"] = unit
+
+        (self._log_methods.get(severity) or self.logger.info)(message, extra=props)
+
+    def log_events_bulk(self, event_name, message, rows, severity="INFO", unit=None, **props):
+        """ Structured log that folds several same-type events into one record """
+
+        self.log_event(event_name, message, severity=severity, unit=unit, events=json.dumps(rows), count=len(rows), **props)
 
 
 class AzureDataFactory:
@@ -68,38 +131,74 @@ class AzureDataFactory:
     AZURE_DATA_FACTORY_RESOURCE_GROUP     = config.AZURE_DATA_FACTORY_RESOURCE_GROUP
     AZURE_DATA_FACTORY_SUBSCRIPTION_ID    = config.AZURE_DATA_FACTORY_SUBSCRIPTION_ID
     AZURE_DATA_FACTORY_PIPELINE_NAME      = config.AZURE_DATA_FACTORY_PIPELINE_NAME
+    MANAGEMENT_SCOPE                      = "https://management.azure.com/.default"
+    TOKEN_REFRESH_MARGIN                  = 300  # Seconds before expiry at which the token is renewed
 
     
-    def __init__(self):
+    def __init__(self, credential=None):
         """Initialize the Azure Data Factory client."""
         current_func = get_failed_function_name()
         try:
-            self.credential = ClientSecretCredential(
-                config.AZURE_TENANT_ID, 
-                config.AZURE_DATA_FACTORY_CLIENT_ID, 
-                config.AZURE_DATA_FACTORY_CLIENT_SECRET
+            self.credential = credential or _get_data_factory_credential()
+
+            # Token is fetched lazily on first use and cached until near expiry
+            self._token = None
+
+            # Persistent session so repeated triggers reuse the TLS connection.
+            # Retry's default allowed_methods excludes POST, so createRun is only
+            # retried on connection errors and never sent twice after a response.
+            self.session = requests.Session()
+            self.session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=4,
+                    pool_maxsize=16,
+                    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+                )
             )
 
-            token = self.credential.get_token("https://management.azure.com/.default").token
-
             # Construct ADF REST URL
             self.url = (
                 f"https://management.azure.com/subscriptions/{self.AZURE_DATA_FACTORY_SUBSCRIPTION_ID}/resourceGroups/{self.AZURE_DATA_FACTORY_RESOURCE_GROUP}"
                 f"/providers/Microsoft.DataFactory/factories/{self.AZURE_DATA_FACTORY_NAME}/pipelines/{self.AZURE_DATA_FACTORY_PIPELINE_NAME}/createRun"
                 f"?api-version=2018-06-01"
             )
-
-            self.headers = {
-                "Authorization": f"Bearer {token}",
-                "Content-Type": "application/json"
-            }
         except Exception as e:
             raise CustomError(current_func,f"Failed to initialize AzureDataFactory: {str(e)}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Close the underlying HTTP session."""
+        self.session.close()
+
+    def _auth_header(self):
+        """Return the bearer token header value, refreshing the cached token when due."""
+        now = time.time()
+        token = self._token
+
+        if (
+            token is None
+            or now >= token.expires_on - self.TOKEN_REFRESH_MARGIN
+            or (token.refresh_on is not None and now >= token.refresh_on)
+        ):
+            token = self._token = self.credential.get_token_info(self.MANAGEMENT_SCOPE)
+
+        return f"Bearer {token.token}"
         
     def trigger_pipeline(self, pipeline_parameters=None):
         """Trigger the Azure Data Factory pipeline."""
+
+        headers = {
+            "Authorization": self._auth_header(),
+            "Content-Type": "application/json"
+        }
        
-        response = requests.post(self.url, headers=self.headers, json={"parameters": pipeline_parameters})
+        response = self.session.post(self.url, headers=headers, json={"parameters": pipeline_parameters}, timeout=(5, 30))
 
         if response.status_code == 200:
             run_id = response.json()["runId"]
@@ -122,27 +221,60 @@ class AzureDataLake:
   AZURE_CONTAINER_NAME      = config.AZURE_CONTAINER_NAME
   AZURE_REMOTE_PATH         = config.AZURE_REMOTE_PATH
   SOURCE_PREFIX             = "files/sbt/quotes/"
+  MAX_CONNECTIONS           = config.MAX_CONNECTIONS
+  MAX_UPLOAD_WORKERS        = config.MAX_UPLOAD_WORKERS
+  LIST_PAGE_SIZE            = 5000  # Blobs per list_blobs page (service maximum)
+  DELETE_BATCH_SIZE         = 256  # Max sub-requests per blob batch call
+  COPY_POLL_INTERVAL        = 0.5  # Seconds between copy status checks for pending server-side copies
+  COPY_TIMEOUT              = 300  # Seconds a pending server-side copy may take before it is aborted
   
 
-  def __init__(self, config_path="config.json"):
+  def __init__(self, config_path="config.json", credential=None):
     """Initialize the Azure Data Lake client."""
     
     try: 
-        self.credential = ClientSecretCredential(
-        config.AZURE_TENANT_ID, 
-        config.AZURE_CLIENT_ID, 
-        config.AZURE_CLIENT_SECRET
-        )
+        self.credential = credential or _get_credential()
+
+        # Per-blob progress lines on stderr; under python -O they are compiled out entirely
+        self.verbose = config.SPLIT_VERBOSE
+
+        # Size the HTTP connection pool to the worker counts so threads don't queue for a connection
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=self.MAX_CONNECTIONS + self.MAX_UPLOAD_WORKERS))
+
         self.service_client = BlobServiceClient(
         account_url=f"https://{self.AZURE_ACCOUNT_NAME}.blob.core.windows.net",
-        credential=self.credential
+        credential=self.credential,
+        transport=RequestsTransport(session=session, session_owner=True)
         )
         self.container_client = self.service_client.get_container_client(self.AZURE_CONTAINER_NAME)
+
+        # Shared by all blob workers to fan out a quote's extract file uploads
+        self._upload_pool = ThreadPoolExecutor(max_workers=self.MAX_UPLOAD_WORKERS)
         
         # Load splitting config
         self.config_path = config_path
         self.config = self._load_config()
 
+        # Config values read for every blob, resolved once
+        self.key_field = self.config.get("key_field", "QuoteId")
+        self.extract_objects = tuple(self.config.get("extract_objects", []))
+        self._prefix_len = len(self.SOURCE_PREFIX)
+
+        # Per-object output constants, specialized once for the loaded config:
+        # (object name, encoded '"name":' member prefix, output folder, whether Tracking is appended)
+        self._key_member_prefix = b'{' + orjson.dumps(self.key_field) + b':'
+        self._extract_specs = tuple(
+            (obj_name, b',' + orjson.dumps(obj_name) + b':', f"{self.SOURCE_PREFIX}{obj_name}/", obj_name != "Tracking")
+            for obj_name in self.extract_objects
+        )
+
+        # Folders under SOURCE_PREFIX that hold outputs or archives and are never split again.
+        # Names are matched against the whole first path segment, so directory entries such as
+        # an HNS account's zero-length '{SOURCE_PREFIX}QuoteCharges' blob are skipped too.
+        self._skip_names = frozenset(self.extract_objects) | {"original"}
+        self._skip_prefixes = (f"{self.SOURCE_PREFIX}Archive", f"{self.SOURCE_PREFIX}Original")
+
     except Exception as e:
         raise CustomError(get_failed_function_name(),f"Failed to initialize AzureDataLake: {str(e)}")
 
@@ -155,62 +287,149 @@ class AzureDataLake:
 
   def _get_key_value(self, quote_data):
     """Extract the key field value from quote data."""
-    key_field = self.config.get("key_field", "QuoteId")
-    return quote_data.get(key_field)
+    return quote_data.get(self.key_field)
 
 
-  def _extract_filename_parts(self, filename):
-    """Extract timestamp and quote ID from filename.
-    
-    Expected format: {timestamp}_{quoteId}.json
-    Returns: (timestamp, quote_id) or (None, None) if format doesn't match
-    """
-    # Remove .json extension
-    base_name = filename.replace('.json', '')
-    
-    # Check if it's already a split file (contains underscore after quote ID)
-    # Format: {timestamp}_{quoteId}_{ObjectName}.json
-    parts = base_name.split('_')
-    
-    if len(parts) >= 2:
-      timestamp = parts[0]
-      quote_id = parts[1]
-      return timestamp, quote_id
-    
-    return None, None
+  def _upload_one(self, output_blob_path, output_content):
+    """Upload one extracted file, overwriting any previous version."""
+    output_blob = self.container_client.get_blob_client(output_blob_path)
+    output_blob.upload_blob(output_content, length=len(output_content), overwrite=True, max_concurrency=1)
+    if __debug__ and self.verbose:
+        sys.stderr.write(f"Created: {output_blob_path}\n")
 
-  def _process_blob(self, blob):
-    """Process a single blob: split it and upload to Data Lake folders."""
+  def _is_archived(self, blob_client, source):
+    """Return True if blob_client holds a completed archived copy of the listed source blob.
+
+    The copy must have the same size and, when both sides carry one, the same Content-MD5;
+    without an MD5 the source must not have changed since the copy completed. Anything else
+    (a re-delivered or corrected quote under the same name) is treated as not archived.
+    """
     try:
-        blob_name = blob.name
-        extract_objects = self.config.get("extract_objects", [])
+        archived = blob_client.get_blob_properties()
+    except ResourceNotFoundError:
+        return False
+
+    if archived.copy.status not in (None, "success") or archived.size != source.size:
+        return False
+
+    archived_md5 = archived.content_settings.content_md5
+    source_md5 = source.content_settings.content_md5
+    if archived_md5 and source_md5:
+        return bytes(archived_md5) == bytes(source_md5)
+
+    completion_time = archived.copy.completion_time
+    return completion_time is not None and source.last_modified <= completion_time
+
+  def _wait_for_copy(self, blob_client, copy):
+    """Block until a server-side copy into blob_client has finished.
+
+    Same-account copies normally complete within the start call; otherwise poll
+    the destination's copy status for up to COPY_TIMEOUT seconds, aborting the
+    copy when it expires. Raises if the copy did not succeed.
+    """
+    copy_status = copy["copy_status"]
+    deadline = time.monotonic() + self.COPY_TIMEOUT
+
+    while copy_status == "pending":
+      if time.monotonic() >= deadline:
+        try:
+          blob_client.abort_copy(copy["copy_id"])
+        except Exception:
+          pass  # The copy may have finished or failed meanwhile; the source is kept either way
+        raise CustomError(get_failed_function_name(), f"Copy to {blob_client.blob_name} did not finish within {self.COPY_TIMEOUT}s and was aborted")
+      time.sleep(self.COPY_POLL_INTERVAL)
+      copy_status = blob_client.get_blob_properties().copy.status
+
+    if copy_status != "success":
+      raise CustomError(get_failed_function_name(), f"Copy to {blob_client.blob_name} ended with status '{copy_status}'")
+
+  def _encode_outputs(self, blob_name, quote_data, key_value, timestamp, quote_id):
+    """Encode the extract files for one quote.
+
+    Returns (uploads, split_events): (blob path, content) pairs and their log rows.
+    """
+    # Members shared by every extract file are encoded once per quote
+    key_member = self._key_member_prefix + orjson.dumps(key_value)
+    tracking_member = b',"Tracking":' + orjson.dumps(quote_data["Tracking"]) if "Tracking" in quote_data else b''
+
+    # Extract each object
+    uploads = []
+    split_events = []
+    
+    for obj_name, obj_member_prefix, output_folder, include_tracking in self._extract_specs:
+        if obj_name not in quote_data:
+            # Skip if object doesn't exist in quote data
+            continue
         
-        # Skip blobs in extract_objects folders and original folder
-        # Check if blob path contains any extract_object folder name
-        blob_path_after_prefix = blob_name[len(self.SOURCE_PREFIX):]
-        path_parts = blob_path_after_prefix.split('/')
+        # Skip if object is empty (empty array, empty dict, empty string, etc.)
+        obj_value = quote_data[obj_name]
+        if not obj_value or (isinstance(obj_value, str) and not obj_value.strip()) or (isinstance(obj_value, (list, dict)) and len(obj_value) == 0):
+            logger_api.log_event(
+                "extract_object_skipped",
+                f"Extract object '{obj_name}' is empty, skipping file generation",
+                severity="WARNING",
+                blob_name=blob_name,
+                object_name=obj_name,
+                quote_id=key_value
+            )
+            continue
         
-        # If first part of path matches any extract_object, skip it
-        if path_parts and path_parts[0] in extract_objects:
-            return
+        # Create extracted data with key field, the object, and Tracking (always included if it exists)
+        output_content = (
+            key_member
+            + obj_member_prefix + orjson.dumps(obj_value)
+            + (tracking_member if include_tracking else b'')
+            + b'}'
+        )
         
-        # Skip blobs already in original folder
-        if path_parts and path_parts[0] == "original":
-            return
+        # Create output filename
+        output_filename = f"{timestamp}_{quote_id}_{obj_name}.json"
+        
+        # Create blob path with object folder: {SOURCE_PREFIX}{obj_name}/{filename}
+        output_blob_path = output_folder + output_filename
         
+        uploads.append((output_blob_path, output_content))
+        split_events.append({"blob_name": output_blob_path, "object_name": obj_name})
+
+    return uploads, split_events
+
+  def _process_blob(self, blob):
+    """Process a single listed blob: split it and upload to Data Lake folders."""
+    blob_name = blob.name
+    try:
+        # Expected format: {timestamp}_{quoteId}.json; split files are {timestamp}_{quoteId}_{ObjectName}.json
+        filename = os.path.basename(blob_name)
+        base_name = filename[:-5] if filename.endswith('.json') else filename
+        parts = base_name.split('_', 2)
+
         # Skip already split files (contain _{ObjectName})
-        base_name = os.path.basename(blob_name).replace('.json', '')
-        parts = base_name.split('_')
-        if len(parts) > 2:  # Already split
+        if len(parts) > 2:
             return
 
+        original_blob_path = f"{self.SOURCE_PREFIX}Original/{filename}"
+        original_blob = self.container_client.get_blob_client(original_blob_path)
+
+        # A matching completed copy in Original means an earlier run split this quote but did not delete
+        # the source; one HEAD request lets it be deleted without downloading it again
+        if self._is_archived(original_blob, blob):
+            logger_api.log_event(
+                "quote_already_archived",
+                f"Quote already present in original folder, deleting leftover source",
+                severity="INFO",
+                original_path=blob_name,
+                new_path=original_blob_path
+            )
+            return blob_name
+
         # Read original blob content
         source_blob = self.container_client.get_blob_client(blob_name)
-        raw_content = source_blob.download_blob().readall().decode('utf-8') 
-        print(f"Blob name: {blob_name}")
-        #print(f"Raw content: {raw_content}")
-        # Parse JSON
-        quote_data = json.loads(raw_content)
+        if __debug__ and self.verbose:
+            sys.stderr.write(f"Blob name: {blob_name}\n")
+        # Parse JSON straight from the downloaded bytes; the bytes are not kept once parsed
+        # Pinned to the listed version, so the split, the Original copy and the delete all see the same content
+        quote_data = orjson.loads(
+            source_blob.download_blob(max_concurrency=4, etag=blob.etag, match_condition=MatchConditions.IfNotModified).readall()
+        )
 
         # Get key value
         key_value = self._get_key_value(quote_data)
@@ -218,87 +437,54 @@ class AzureDataLake:
         if not key_value or (isinstance(key_value, str) and not key_value.strip()) or (isinstance(key_value, (list, dict)) and len(key_value) == 0):
             logger_api.log_event(
                 "split_quote_skipped",
-                f"Key field '{self.config.get('key_field', 'QuoteId')}' is missing or empty in quote data",
+                f"Key field '{self.key_field}' is missing or empty in quote data",
                 severity="WARNING",
                 blob_name=blob_name
             )
             return
 
         # Extract filename parts
-        filename = os.path.basename(blob_name)
-        timestamp, quote_id_from_file = self._extract_filename_parts(filename)
+        timestamp, quote_id_from_file = parts if len(parts) == 2 else (None, None)
         
         # Use quote_id from file if available, otherwise use key_value
-        quote_id = quote_id_from_file if quote_id_from_file else key_value
-
-        # If no timestamp in filename, use current timestamp
-        if not timestamp:
-            timestamp = str(int(time.time()))
-
-        # Extract each object
-        split_successful = False
-        
-        for obj_name in extract_objects:
-            if obj_name not in quote_data:
-                # Skip if object doesn't exist in quote data
-                continue
-            
-            # Skip if object is empty (empty array, empty dict, empty string, etc.)
-            obj_value = quote_data[obj_name]
-            if not obj_value or (isinstance(obj_value, str) and not obj_value.strip()) or (isinstance(obj_value, (list, dict)) and len(obj_value) == 0):
-                logger_api.log_event(
-                    "extract_object_skipped",
-                    f"Extract object '{obj_name}' is empty, skipping file generation",
-                    severity="WARNING",
-                    blob_name=blob_name,
-                    object_name=obj_name,
-                    quote_id=key_value
-                )
-                continue
-            
-            # Create extracted data with key field, the object, and Tracking
-            extracted_data = {
-                self.config["key_field"]: key_value,
-                obj_name: quote_data[obj_name]
-            }
-            
-            # Always include Tracking object if it exists
-            if "Tracking" in quote_data:
-                extracted_data["Tracking"] = quote_data["Tracking"]
-            
-            # Create output filename
-            output_filename = f"{timestamp}_{quote_id}_{obj_name}.json"
-            
-            # Create blob path with object folder: {SOURCE_PREFIX}{obj_name}/{filename}
-            output_blob_path = f"{self.SOURCE_PREFIX}{obj_name}/{output_filename}"
-            
-            # Upload extracted data to blob
-            output_blob = self.container_client.get_blob_client(output_blob_path)
-            output_content = json.dumps(extracted_data, indent=2, ensure_ascii=False)
-            output_blob.upload_blob(output_content.encode('utf-8'), overwrite=True)
-            
-            logger_api.log_event(
+        quote_id = quote_id_from_file or key_value
+
+        # If no timestamp in filename, use the run's timestamp
+        timestamp = timestamp or self._run_timestamp
+
+        # Encode every extract file, then drop the parsed quote so only the encoded outputs are held
+        # while waiting on uploads (the helper's references to parsed values go out of scope with it)
+        uploads, split_events = self._encode_outputs(blob_name, quote_data, key_value, timestamp, quote_id)
+        del quote_data
+
+        # Upload extracted data to blobs; several files are uploaded concurrently on the shared upload pool
+        if len(uploads) == 1:
+            self._upload_one(*uploads[0])
+        elif uploads:
+            futures = [self._upload_pool.submit(self._upload_one, *upload) for upload in uploads]
+            for future in as_completed(futures):
+                future.result()
+        split_successful = bool(uploads)
+
+        if split_events:
+            logger_api.log_events_bulk(
                 "quote_split_success",
-                f"Split quote object uploaded",
+                f"Split quote objects uploaded",
+                split_events,
                 severity="INFO",
-                blob_name=output_blob_path,
-                object_name=obj_name,
+                blob_name=blob_name,
                 quote_id=key_value
             )
-            
-            print(f"Created: {output_blob_path}")
-            split_successful = True
         
         # Move original blob to /original folder after processing (even if no files were created)
-        filename = os.path.basename(blob_name)
-        original_blob_path = f"{self.SOURCE_PREFIX}Original/{filename}"
-        
-        # Copy blob to original folder (we already have the content in raw_content)
-        original_blob = self.container_client.get_blob_client(original_blob_path)
-        original_blob.upload_blob(raw_content.encode('utf-8'), overwrite=True)
-        
-        # Delete original blob after successful copy
-        source_blob.delete_blob()
+        # Copy blob to original folder server-side, then delete the source once the copy has landed
+        # Only copy the version that was split; a source changed since listing fails the copy and is kept
+        copy = original_blob.start_copy_from_url(
+            source_blob.url,
+            source_etag=blob.etag,
+            source_match_condition=MatchConditions.IfNotModified
+        )
+        self._wait_for_copy(original_blob, copy)
         
         logger_api.log_event(
             "quote_moved_to_original",
@@ -309,48 +495,158 @@ class AzureDataLake:
             quote_id=key_value,
             files_created=split_successful
         )
-        print(f"Moved original to: {original_blob_path}")
+        if __debug__ and self.verbose:
+            sys.stderr.write(f"Moved original to: {original_blob_path}\n")
+
+        # Source is deleted by the caller in batches once the copy has landed
+        return blob_name
     
     except Exception as e:
         logger_api.log_event(
             "blob_processing_error",
             f"Error processing blob: {str(e)}",
             severity="ERROR",
-            blob_name=blob.name if hasattr(blob, 'name') else 'unknown'
+            blob_name=blob_name
         )
         raise
 
+  def _is_source_blob(self, blob_name):
+    """Return True if the blob is an unprocessed quote rather than a split output or archived copy."""
+    path_parts = blob_name[self._prefix_len:].split('/')
+    return (
+        path_parts[0] not in self._skip_names
+        and not blob_name.startswith(self._skip_prefixes)
+        and "Archive" not in path_parts
+    )
+
+  def _iter_listing_pages(self):
+    """Yield listing pages of candidate blobs under SOURCE_PREFIX.
+
+    The top level is walked with a '/' delimiter so output and archive folders
+    are rejected by name and never listed; remaining subfolders are then listed flat.
+    """
+    subfolders = []
+    top_level = self.container_client.walk_blobs(
+        name_starts_with=self.SOURCE_PREFIX,
+        delimiter='/',
+        results_per_page=self.LIST_PAGE_SIZE
+    ).by_page()
+
+    for page in top_level:
+        blobs = []
+        for item in page:
+            if isinstance(item, BlobPrefix):
+                if self._is_source_blob(item.name):
+                    subfolders.append(item.name)
+            else:
+                blobs.append(item)
+        yield blobs
+
+    for folder in subfolders:
+        yield from self.container_client.list_blobs(
+            name_starts_with=folder,
+            results_per_page=self.LIST_PAGE_SIZE
+        ).by_page()
+
+  def _next_page(self, pages):
+    """Fetch the next listing page and return its source blobs' properties, or None when exhausted."""
+    page = next(pages, None)
+    if page is None:
+        return None
+    return [blob for blob in page if self._is_source_blob(blob.name)]
+
+  def _collect_results(self, future_to_blob):
+    """Wait for a batch of blob tasks, logging failures without aborting the batch.
+
+    Returns the listed properties of source blobs that were archived and can be deleted.
+    """
+    archived = []
+    for future in as_completed(future_to_blob):
+        blob = future_to_blob[future]
+        blob_name = blob.name
+        try:
+            if future.result():  # This will raise any exception that occurred
+                archived.append(blob)
+        except Exception as e:
+            logger_api.log_event(
+                "blob_processing_failed",
+                f"Failed to process blob {blob_name}: {str(e)}",
+                severity="ERROR",
+                blob_name=blob_name
+            )
+    return archived
+
+  def _delete_sources(self, blobs):
+    """Delete archived source blobs with a single batch request, logging any that fail.
+
+    Each delete is conditional on the listed etag, so a quote re-delivered under the same
+    name since it was split is left for the next run. Never raises: a failed batch leaves
+    its sources in place to be picked up by the next run.
+    """
+    blob_names = [blob.name for blob in blobs]
+    try:
+        responses = self.container_client.delete_blobs(
+            *[{"name": blob.name, "etag": blob.etag, "match_condition": MatchConditions.IfNotModified} for blob in blobs],
+            raise_on_any_failure=False
+        )
+    except Exception as e:
+        for blob_name in blob_names:
+            logger_api.log_event(
+                "blob_delete_failed",
+                f"Failed to delete source blob {blob_name}: {str(e)}",
+                severity="ERROR",
+                blob_name=blob_name
+            )
+        return
+
+    for blob_name, response in zip(blob_names, responses):
+        if response.status_code == 412:
+            logger_api.log_event(
+                "blob_delete_skipped",
+                f"Source blob {blob_name} changed since it was split, leaving it for the next run",
+                severity="INFO",
+                blob_name=blob_name
+            )
+        elif response.status_code not in (200, 202, 404):
+            logger_api.log_event(
+                "blob_delete_failed",
+                f"Failed to delete source blob {blob_name}: {response.status_code}",
+                severity="ERROR",
+                blob_name=blob_name
+            )
+
   def split_all_quotes(self):
-    """Read all quote blobs, split them, and upload to Data Lake folders using 4 threads."""
+    """Read all quote blobs, split them, and upload to Data Lake folders using MAX_CONNECTIONS threads."""
     
     try:
-        all_blobs = self.container_client.list_blobs(name_starts_with=self.SOURCE_PREFIX)
-        
-        # Filter out Archive blobs before processing
-        blobs = [
-            blob for blob in all_blobs 
-            if "Archive" not in blob.name[len(self.SOURCE_PREFIX):].split('/')
-            and not blob.name.startswith(f"{self.SOURCE_PREFIX}Archive")
-            and not blob.name.startswith(f"{self.SOURCE_PREFIX}Original")
-        ]
+        # Fallback timestamp for quotes whose filename has none
+        self._run_timestamp = str(time.time_ns() // 1_000_000_000)
+
+        pages = self._iter_listing_pages()
         
-        # Process blobs in parallel with 4 threads
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            # Submit all blob processing tasks
-            future_to_blob = {executor.submit(self._process_blob, blob): blob for blob in blobs}
-            
-            # Process completed tasks
-            for future in as_completed(future_to_blob):
-                blob = future_to_blob[future]
-                try:
-                    future.result()  # This will raise any exception that occurred
-                except Exception as e:
-                    logger_api.log_event(
-                        "blob_processing_failed",
-                        f"Failed to process blob {blob.name}: {str(e)}",
-                        severity="ERROR",
-                        blob_name=blob.name
-                    )
+        # One thread lists pages ahead while the pool processes blobs, one thread per pooled connection
+        with ThreadPoolExecutor(max_workers=1) as lister, ThreadPoolExecutor(max_workers=self.MAX_CONNECTIONS) as executor:
+            to_delete = []
+            try:
+                page = lister.submit(self._next_page, pages).result()
+
+                while page is not None:
+                    # Prefetch the following page so its list round-trip overlaps this page's blob I/O
+                    next_page = lister.submit(self._next_page, pages)
+
+                    future_to_blob = {executor.submit(self._process_blob, blob): blob for blob in page}
+                    to_delete.extend(self._collect_results(future_to_blob))
+
+                    # Delete archived sources in full batches; the service accepts up to DELETE_BATCH_SIZE per request
+                    while len(to_delete) >= self.DELETE_BATCH_SIZE:
+                        self._delete_sources(to_delete[:self.DELETE_BATCH_SIZE])
+                        del to_delete[:self.DELETE_BATCH_SIZE]
+
+                    page = next_page.result()
+            finally:
+                # Sources collected so far are already archived, so flush them even if listing failed
+                if to_delete:
+                    self._delete_sources(to_delete)
 
     except Exception as e:
         raise CustomError(get_failed_function_name(),f"Failed to split quotes: {str(e)}")
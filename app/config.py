@@ -18,6 +18,9 @@ AZURE_CLIENT_SECRET = os.getenv("AZURE_CLIENT_SECRET")
 AZURE_ACCOUNT_NAME = os.getenv("AZURE_ACCOUNT_NAME")
 AZURE_CONTAINER_NAME = os.getenv("AZURE_CONTAINER_NAME")
 AZURE_REMOTE_PATH = os.getenv("AZURE_REMOTE_PATH")
+MAX_CONNECTIONS = int(os.getenv("MAX_CONNECTIONS", "32"))  # Worker threads / pooled HTTP connections for blob I/O
+MAX_UPLOAD_WORKERS = int(os.getenv("MAX_UPLOAD_WORKERS", "8"))  # Threads shared for uploading a quote's extract files
+SPLIT_VERBOSE = bool(int(os.getenv("SPLIT_VERBOSE", "0")))  # Write per-blob progress lines to stderr
 
 # Replace with your Graph details
 GRAPH_CLIENT_ID = os.getenv("GRAPH_CLIENT_ID")